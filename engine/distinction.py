@@ -12,18 +12,20 @@ This module implements a timeless, self-consistent graph where all entities
 and relationships emerge from repeated application of the synthesis operation.
 """
 
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Set, Tuple, Dict
+from typing import Set, Tuple, Dict, List, Optional, Iterator
 import hashlib
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Distinction:
     """
     Axiom: Identity.
 
     A distinction is defined solely by its unique identifier.
     All properties emerge from relationships with other distinctions.
+    Slotted storage holds the identifier and nothing else.
     """
     id: str
 
@@ -53,6 +55,8 @@ class DistinctionEngine:
         self.relationships: Set[Tuple[str, str]] = set()
         self._add_relationship(self.d0.id, self.d1.id)
 
+        self._journal: Optional[List[Tuple[str, str, str]]] = None
+
     def _add_relationship(self, id_a: str, id_b: str):
         """Axiom: Symmetry. Store relationships in canonical order."""
         if id_a < id_b:
@@ -60,6 +64,13 @@ class DistinctionEngine:
         else:
             self.relationships.add((id_b, id_a))
 
+    def _remove_relationship(self, id_a: str, id_b: str):
+        """Axiom: Symmetry. Remove a relationship stored in canonical order."""
+        if id_a < id_b:
+            self.relationships.discard((id_a, id_b))
+        else:
+            self.relationships.discard((id_b, id_a))
+
     def synthesize(self, a: Distinction, b: Distinction) -> Distinction:
         """
         Axiom: Synthesis.
@@ -86,8 +97,39 @@ class DistinctionEngine:
         self._add_relationship(new_distinction.id, a.id)
         self._add_relationship(new_distinction.id, b.id)
 
+        if self._journal is not None:
+            self._journal.append((new_distinction.id, a.id, b.id))
+
         return new_distinction
 
+    @contextmanager
+    def transaction(self) -> Iterator["DistinctionEngine"]:
+        """
+        Scope hypothetical synthesis that is discarded on exit.
+
+        Records each distinction created inside the block together with its
+        two relationships and removes them when the block exits, restoring
+        the prior state without copying it. Transactions may be nested.
+        Snapshots taken inside the block share the live relationship set and
+        must be observed before exit. If all_distinctions is reassigned
+        inside the block, rollback skips entries the new mapping lacks.
+        """
+        outermost = self._journal is None
+        if outermost:
+            self._journal = []
+        mark = len(self._journal)
+
+        try:
+            yield self
+        finally:
+            while len(self._journal) > mark:
+                new_id, id_a, id_b = self._journal.pop()
+                self.all_distinctions.pop(new_id, None)
+                self._remove_relationship(new_id, id_a)
+                self._remove_relationship(new_id, id_b)
+            if outermost:
+                self._journal = None
+
     def get_state_snapshot(self) -> Tuple[Set[Distinction], Set[Tuple[str, str]]]:
         """
         Return an immutable snapshot of all distinctions and relationships.
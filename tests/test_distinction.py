@@ -23,6 +23,23 @@ class TestAxioms(unittest.TestCase):
         self.d0 = self.engine.d0
         self.d1 = self.engine.d1
 
+    def test_axiom_identity(self):
+        """
+        Axiom: Identity.
+
+        Validates that a distinction carries no state beyond its identifier
+        and that the identifier cannot be reassigned.
+        """
+        self.assertFalse(hasattr(self.d0, '__dict__'))
+
+        with self.assertRaises(AttributeError):
+            self.d0.id = "2"
+
+        with self.assertRaises((AttributeError, TypeError)):
+            self.d0.label = "origin"
+
+        self.assertEqual(self.d0, Distinction(id="0"))
+
     def test_axiom_irreflexivity(self):
         """
         Axiom: Irreflexivity.
@@ -99,5 +116,85 @@ class TestAxioms(unittest.TestCase):
         self.assertEqual(count_distinctions_1, count_distinctions_2)
         self.assertEqual(count_relationships_1, count_relationships_2)
 
+    def test_transaction_rollback(self):
+        """
+        Transaction: Rollback.
+
+        Validates that distinctions and relationships created inside a
+        transaction are observable within it and removed on exit, while
+        state that existed before the transaction is preserved.
+        """
+        c = self.engine.synthesize(self.d0, self.d1)
+
+        distinctions_before = dict(self.engine.all_distinctions)
+        relationships_before = set(self.engine.relationships)
+
+        with self.engine.transaction():
+            d = self.engine.synthesize(c, self.d0)
+            self.assertIs(self.engine.synthesize(self.d0, self.d1), c)
+
+            with self.engine.transaction():
+                e = self.engine.synthesize(d, self.d1)
+                self.assertIn(e.id, self.engine.all_distinctions)
+
+            self.assertNotIn(e.id, self.engine.all_distinctions)
+            self.assertIn(d.id, self.engine.all_distinctions)
+            self.assertEqual(len(self.engine.relationships), len(relationships_before) + 2)
+
+        self.assertEqual(self.engine.all_distinctions, distinctions_before)
+        self.assertEqual(self.engine.relationships, relationships_before)
+
+    def test_transaction_rollback_on_error(self):
+        """
+        Transaction: Rollback on error.
+
+        Validates that an exception raised inside a transaction still
+        restores the prior state.
+        """
+        relationships_before = set(self.engine.relationships)
+
+        with self.assertRaises(RuntimeError):
+            with self.engine.transaction():
+                self.engine.synthesize(self.d0, self.d1)
+                raise RuntimeError
+
+        self.assertEqual(len(self.engine.all_distinctions), 2)
+        self.assertEqual(self.engine.relationships, relationships_before)
+
+    def test_transaction_rollback_after_reassignment(self):
+        """
+        Transaction: Rollback after the distinction map is replaced.
+
+        Validates that rollback tolerates all_distinctions being reassigned
+        inside the block and still removes the journaled relationships.
+        """
+        relationships_before = set(self.engine.relationships)
+
+        with self.engine.transaction():
+            self.engine.synthesize(self.d0, self.d1)
+            self.engine.all_distinctions = {self.d0.id: self.d0, self.d1.id: self.d1}
+
+        self.assertEqual(len(self.engine.all_distinctions), 2)
+        self.assertEqual(self.engine.relationships, relationships_before)
+
+    def test_synthesis_after_rollback(self):
+        """
+        Synthesis: Consistency after rollback.
+
+        Validates that re-synthesizing a pair discarded by a transaction
+        recreates the same distinction and its relationships.
+        """
+        with self.engine.transaction():
+            rolled_back = self.engine.synthesize(self.d0, self.d1)
+
+        c = self.engine.synthesize(self.d1, self.d0)
+
+        expected_id = hashlib.sha256(f"{self.d0.id}:{self.d1.id}".encode()).hexdigest()
+        self.assertEqual(c.id, expected_id)
+        self.assertEqual(c, rolled_back)
+        self.assertIn(c.id, self.engine.all_distinctions)
+        self.assertIn(tuple(sorted((c.id, self.d0.id))), self.engine.relationships)
+        self.assertIn(tuple(sorted((c.id, self.d1.id))), self.engine.relationships)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
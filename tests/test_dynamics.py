@@ -111,8 +111,8 @@ class TestEmergentDynamics(unittest.TestCase):
         Randomly selects pairs from within the subprocess node set,
         allowing measurement of localized evolutionary dynamics.
         """
-        local_distinctions = [d for d in self.engine.all_distinctions.values()
-                              if d.id in subprocess_nodes]
+        local_distinctions = [self.engine.all_distinctions[node_id] for node_id in subprocess_nodes
+                              if node_id in self.engine.all_distinctions]
         
         if len(local_distinctions) < 2:
             return
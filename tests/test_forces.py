@@ -122,10 +122,10 @@ class TestEmergentForces(unittest.TestCase):
         temp_engine.all_distinctions = {d.id: d for d in distinctions}
         temp_engine.relationships = relationships.copy()
 
-        distinctions_A = [d for d in temp_engine.all_distinctions.values()
-                          if d.id in subprocess_A_nodes]
-        distinctions_B = [d for d in temp_engine.all_distinctions.values()
-                          if d.id in subprocess_B_nodes]
+        distinctions_A = [temp_engine.all_distinctions[node_id] for node_id in subprocess_A_nodes
+                          if node_id in temp_engine.all_distinctions]
+        distinctions_B = [temp_engine.all_distinctions[node_id] for node_id in subprocess_B_nodes
+                          if node_id in temp_engine.all_distinctions]
 
         if not distinctions_A or not distinctions_B:
             return temp_engine.get_state_snapshot()
@@ -12,9 +12,10 @@ Falsification Targets:
 """
 
 import unittest
-import networkx as nx
 import numpy as np
 import random
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from typing import List, Tuple, Optional, Dict, Set
 
 # Import the implementation from the 'distinction.py' file
@@ -26,13 +27,24 @@ class TestEmergentGeometry(unittest.TestCase):
         """Initialize a fresh engine instance for each test."""
         self.engine = DistinctionEngine()
 
-    def _build_graph_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> nx.Graph:
-        """Convert engine state snapshot to NetworkX graph for analysis."""
+    def _build_matrix_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> csr_matrix:
+        """Convert engine state snapshot to a sparse adjacency matrix over integer indices."""
         distinctions, relationships = state
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in distinctions])
-        g.add_edges_from(relationships)
-        return g
+        id_to_idx = {d.id: i for i, d in enumerate(distinctions)}
+        edge_count = len(relationships)
+        rows = np.fromiter((id_to_idx[id_a] for id_a, _ in relationships), dtype=np.int32, count=edge_count)
+        cols = np.fromiter((id_to_idx[id_b] for _, id_b in relationships), dtype=np.int32, count=edge_count)
+        data = np.ones(edge_count, dtype=np.int8)
+        return coo_matrix((data, (rows, cols)), shape=(len(id_to_idx), len(id_to_idx))).tocsr()
+
+    def _build_adjacency_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Dict[str, Set[str]]:
+        """Convert engine state snapshot to a mutable adjacency map for local selection."""
+        distinctions, relationships = state
+        adjacency = {d.id: set() for d in distinctions}
+        for id_a, id_b in relationships:
+            adjacency[id_a].add(id_b)
+            adjacency[id_b].add(id_a)
+        return adjacency
 
     def _evolve_universe(self, steps: int):
         """
@@ -48,87 +60,72 @@ class TestEmergentGeometry(unittest.TestCase):
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        adjacency = self._build_adjacency_from_snapshot(self.engine.get_state_snapshot())
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(g.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(g.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
+            neighbor_ids = adjacency[a.id]
+            neighborhood_ids = neighbor_ids.union(*(adjacency[neighbor_id] for neighbor_id in neighbor_ids))
+            neighborhood_ids.discard(a.id)
 
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
             if c.id not in distinction_map:
                 current_distinctions.append(c)
                 distinction_map[c.id] = c
+                adjacency[c.id] = {a.id, b.id}
+                adjacency[a.id].add(c.id)
+                adjacency[b.id].add(c.id)
 
-    def _get_emergent_dimensionality(self, g: nx.Graph, samples=30, max_radius=5) -> Tuple[float, float]:
+    def _get_emergent_dimensionality(self, adjacency: csr_matrix, samples=30, max_radius=5) -> Tuple[float, float]:
         """
         Estimate fractal (Hausdorff) dimension via volume-radius scaling.
 
         Measures how neighborhood volume scales with radius. Returns mean
         dimension and standard deviation across sampled nodes.
         """
-        if g.number_of_nodes() < samples * max_radius:
+        node_count = adjacency.shape[0]
+        if node_count < samples * max_radius:
             return 0.0, 0.0
 
-        dimensions = []
-        node_list = list(g.nodes())
-        
-        for _ in range(samples):
-            try:
-                sample_node = random.choice(node_list)
-                paths = nx.single_source_shortest_path_length(g, sample_node, cutoff=max_radius)
-                
-                radii = []
-                volumes = []
-                current_volume = 0
-                
-                for r in range(1, max_radius + 1):
-                    nodes_at_this_radius = [node for node, dist in paths.items() if dist == r]
-                    current_volume += len(nodes_at_this_radius)
-                    
-                    if current_volume > 0:
-                        radii.append(r)
-                        volumes.append(current_volume)
-                
-                if len(radii) < 2:
-                    continue
+        sample_indices = [random.randrange(node_count) for _ in range(samples)]
+        distances = dijkstra(adjacency, directed=False, unweighted=True,
+                             indices=sample_indices, limit=max_radius)
 
-                log_r = np.log(radii)
-                log_v = np.log(volumes)
-                
-                slope, _ = np.polyfit(log_r, log_v, 1)
-                
-                dimensions.append(slope)
-                
-            except (nx.NetworkXNoPath, Exception):
-                continue
-        
-        if not dimensions:
+        radii = np.arange(1, max_radius + 1)
+        # Volume at radius r counts nodes at distance 1..r, excluding the sample itself
+        volumes = np.stack([(distances <= r).sum(axis=1) for r in radii], axis=1) - 1
+
+        # Least-squares slope of log(volume) on log(radius), fitted per sample over occupied radii
+        occupied = volumes > 0
+        point_counts = occupied.sum(axis=1)
+        fitted = point_counts >= 2
+        if not fitted.any():
             return 0.0, 0.0
-            
+
+        occupied = occupied[fitted]
+        point_counts = point_counts[fitted]
+        log_r = np.where(occupied, np.log(radii), 0.0)
+        log_v = np.where(occupied, np.log(np.maximum(volumes[fitted], 1)), 0.0)
+
+        centered_r = np.where(occupied, log_r - (log_r.sum(axis=1) / point_counts)[:, None], 0.0)
+        centered_v = np.where(occupied, log_v - (log_v.sum(axis=1) / point_counts)[:, None], 0.0)
+        dimensions = (centered_r * centered_v).sum(axis=1) / (centered_r * centered_r).sum(axis=1)
+
         return np.mean(dimensions), np.std(dimensions)
 
     def test_falsify_emergent_dimensionality(self):
@@ -152,12 +149,12 @@ class TestEmergentGeometry(unittest.TestCase):
         self._evolve_universe(steps=5000)
 
         state = self.engine.get_state_snapshot()
-        g = self._build_graph_from_snapshot(state)
+        adjacency = self._build_matrix_from_snapshot(state)
 
-        self.assertGreater(g.number_of_nodes(), 500, "Evolution failed to produce enough distinctions.")
+        self.assertGreater(adjacency.shape[0], 500, "Evolution failed to produce enough distinctions.")
 
         print("   Measuring fractal dimension...")
-        avg_dim, std_dev_dim = self._get_emergent_dimensionality(g)
+        avg_dim, std_dev_dim = self._get_emergent_dimensionality(adjacency)
 
         print(f"\n   Results:")
         print(f"   Average dimension: {avg_dim:.3f}")
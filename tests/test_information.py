@@ -15,6 +15,7 @@ import unittest
 import networkx as nx
 import numpy as np
 import random
+from itertools import islice
 from typing import List, Tuple, Optional, Dict, Set
 
 # Import the implementation from the 'distinction.py' file
@@ -34,6 +35,15 @@ class TestInformationDynamics(unittest.TestCase):
         g.add_edges_from(relationships)
         return g
 
+    def _build_adjacency_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Dict[str, Set[str]]:
+        """Convert engine state snapshot to a mutable adjacency map for local selection."""
+        distinctions, relationships = state
+        adjacency = {d.id: set() for d in distinctions}
+        for id_a, id_b in relationships:
+            adjacency[id_a].add(id_b)
+            adjacency[id_b].add(id_a)
+        return adjacency
+
     def _evolve_universe_locally(self, steps: int) -> List[Distinction]:
         """
         Execute synthesis operations with local selection bias.
@@ -48,40 +58,36 @@ class TestInformationDynamics(unittest.TestCase):
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        adjacency = self._build_adjacency_from_snapshot(self.engine.get_state_snapshot())
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(g.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(g.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
+            neighbor_ids = adjacency[a.id]
+            neighborhood_ids = neighbor_ids.union(*(adjacency[neighbor_id] for neighbor_id in neighbor_ids))
+            neighborhood_ids.discard(a.id)
 
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
             if c.id not in distinction_map:
                 current_distinctions.append(c)
                 distinction_map[c.id] = c
+                adjacency[c.id] = {a.id, b.id}
+                adjacency[a.id].add(c.id)
+                adjacency[b.id].add(c.id)
 
         return list(self.engine.all_distinctions.values())
 
@@ -89,6 +95,26 @@ class TestInformationDynamics(unittest.TestCase):
         """Return node IDs within specified radius of start node."""
         return set(nx.ego_graph(g, start_node_id, radius=radius).nodes())
 
+    def _get_cached_subprocess(self, cache: Dict[str, Set[str]], g: nx.Graph, start_node_id: str) -> Set[str]:
+        """Return the local subprocess of a node, computing it only on a cache miss."""
+        subprocess_nodes = cache.get(start_node_id)
+        if subprocess_nodes is None:
+            subprocess_nodes = cache[start_node_id] = self._get_local_subprocess(g, start_node_id)
+        return subprocess_nodes
+
+    def _invalidate_subprocesses(self, cache: Dict[str, Set[str]], g: nx.Graph, new_ids: List[str]):
+        """
+        Discard cached subprocesses touched by newly synthesized distinctions.
+
+        A new distinction can only enter a radius-2 neighborhood, or shorten
+        a path within it, when one of its parents already lies inside it.
+        """
+        for new_id in new_ids:
+            parents = set(g.neighbors(new_id))
+            stale = [node_id for node_id, nodes in cache.items() if not parents.isdisjoint(nodes)]
+            for node_id in stale:
+                del cache[node_id]
+
     def _measure_subprocess_coherence(self, g: nx.Graph, subprocess_nodes: Set[str]) -> float:
         """
         Calculate average clustering coefficient for a set of nodes.
@@ -98,9 +124,10 @@ class TestInformationDynamics(unittest.TestCase):
         if not subprocess_nodes:
             return 0.0
 
-        all_coherence_levels = nx.clustering(g)
+        # Only the subprocess is consumed, so clustering is not computed for the rest of the graph
+        coherence_levels = nx.clustering(g, nodes=subprocess_nodes)
         
-        subprocess_coherence = [all_coherence_levels.get(node_id, 0) 
+        subprocess_coherence = [coherence_levels.get(node_id, 0) 
                                 for node_id in subprocess_nodes]
                                 
         if not subprocess_coherence:
@@ -145,6 +172,11 @@ class TestInformationDynamics(unittest.TestCase):
 
         print(f"   Found two disjoint subprocesses (A: {len(subprocess_A_nodes)} nodes, B: {len(subprocess_B_nodes)} nodes).")
 
+        subprocess_cache = {
+            sample_nodes[0].id: subprocess_A_nodes,
+            sample_nodes[1].id: subprocess_B_nodes,
+        }
+
         time_series_A = []
         time_series_B = []
 
@@ -153,13 +185,17 @@ class TestInformationDynamics(unittest.TestCase):
         print(f"   Observing temporal dynamics for {observation_steps} steps...")
 
         for _ in range(observation_steps):
+            count_before = len(self.engine.all_distinctions)
             self._evolve_universe_locally(steps=1)
 
             state_t = self.engine.get_state_snapshot()
             g_t = self._build_graph_from_snapshot(state_t)
 
-            current_A_nodes = self._get_local_subprocess(g_t, sample_nodes[0].id)
-            current_B_nodes = self._get_local_subprocess(g_t, sample_nodes[1].id)
+            new_ids = list(islice(self.engine.all_distinctions, count_before, None))
+            self._invalidate_subprocesses(subprocess_cache, g_t, new_ids)
+
+            current_A_nodes = self._get_cached_subprocess(subprocess_cache, g_t, sample_nodes[0].id)
+            current_B_nodes = self._get_cached_subprocess(subprocess_cache, g_t, sample_nodes[1].id)
 
             state_A = self._measure_subprocess_coherence(g_t, current_A_nodes)
             state_B = self._measure_subprocess_coherence(g_t, current_B_nodes)
@@ -167,8 +203,10 @@ class TestInformationDynamics(unittest.TestCase):
             time_series_A.append(state_A)
             time_series_B.append(state_B)
 
-        correlation_matrix = np.corrcoef(time_series_A, time_series_B)
-        correlation = correlation_matrix[0, 1]
+        deviations_A = np.asarray(time_series_A) - np.mean(time_series_A)
+        deviations_B = np.asarray(time_series_B) - np.mean(time_series_B)
+        correlation = np.dot(deviations_A, deviations_B) / np.sqrt(
+            np.dot(deviations_A, deviations_A) * np.dot(deviations_B, deviations_B))
 
         print(f"\n   Results:")
         print(f"   Temporal correlation: {correlation:.4f}")
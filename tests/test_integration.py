@@ -13,6 +13,9 @@ proving structural fragmentation.
 import unittest
 import networkx as nx
 import random
+from bisect import bisect
+from collections import Counter
+from itertools import accumulate, chain
 from engine import Distinction, DistinctionEngine
 
 class TestUniversalIntegration(unittest.TestCase):
@@ -23,9 +26,8 @@ class TestUniversalIntegration(unittest.TestCase):
     def _build_graph(self):
         """Convert engine state snapshot to NetworkX graph for analysis."""
         state = self.engine.get_state_snapshot()
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in state[0]])
-        g.add_edges_from(state[1])
+        g = nx.Graph(state[1])
+        g.add_nodes_from(d.id for d in state[0])
         return g
 
     def _create_galaxy(self, center_node: Distinction, size=5):
@@ -53,13 +55,16 @@ class TestUniversalIntegration(unittest.TestCase):
         nodes = list(self.engine.all_distinctions.values())
         if not nodes: return
 
-        g = self._build_graph()
-        degrees = dict(g.degree())
-        weights = [degrees.get(d.id, 0) + 1 for d in nodes]
+        degrees = Counter(chain.from_iterable(self.engine.relationships))
+        cum_weights = list(accumulate(degrees[d.id] + 1 for d in nodes))
+
+        total_weight = cum_weights[-1]
+        last_index = len(nodes) - 1
 
         for _ in range(steps):
-            parents = random.choices(nodes, weights=weights, k=2)
-            self.engine.synthesize(parents[0], parents[1])
+            a = nodes[bisect(cum_weights, random.random() * total_weight, 0, last_index)]
+            b = nodes[bisect(cum_weights, random.random() * total_weight, 0, last_index)]
+            self.engine.synthesize(a, b)
 
     def test_falsify_topological_isolation(self):
         """
@@ -79,32 +84,35 @@ class TestUniversalIntegration(unittest.TestCase):
         print("\nTest: Topological Isolation Falsification")
 
         print("   Creating initial substrate (300 nodes)...")
+        all_nodes = list(self.engine.all_distinctions.values())
         for _ in range(300):
-            a = random.choice(list(self.engine.all_distinctions.values()))
-            b = random.choice(list(self.engine.all_distinctions.values()))
-            self.engine.synthesize(a, b)
+            a = random.choice(all_nodes)
+            b = random.choice(all_nodes)
+            count_before = len(self.engine.all_distinctions)
+            c = self.engine.synthesize(a, b)
+            if len(self.engine.all_distinctions) > count_before:
+                all_nodes.append(c)
 
         g_0 = self._build_graph()
-        all_nodes = list(self.engine.all_distinctions.values())
-        seed_a, seed_b = random.sample(all_nodes, 2)
 
         print("   Searching for separated seed nodes...")
-        for _ in range(20):
-            s1, s2 = random.sample(all_nodes, 2)
-            try:
-                d = nx.shortest_path_length(g_0, s1.id, s2.id)
-                if d >= 4:
-                    seed_a, seed_b = s1, s2
-                    break
-            except nx.NetworkXNoPath:
-                continue
+        # A traversal bounded at the separation threshold visits only the local ball around the seed
+        min_separation = 4
+        seed_a = random.choice(all_nodes)
+        seed_distances = nx.single_source_shortest_path_length(g_0, seed_a.id, cutoff=min_separation)
+        separated_ids = [node_id for node_id, d in seed_distances.items() if d == min_separation]
+        if separated_ids:
+            seed_b = self.engine.all_distinctions[random.choice(separated_ids)]
+        else:
+            # The ball is the whole component; its farthest node is the best available partner
+            seed_b = self.engine.all_distinctions[max(seed_distances, key=seed_distances.get)]
 
         galaxy_A = self._create_galaxy(seed_a)
         galaxy_B = self._create_galaxy(seed_b)
 
         g_0 = self._build_graph()
         try:
-            dist_0 = nx.shortest_path_length(g_0, galaxy_A.id, galaxy_B.id)
+            dist_0 = len(nx.bidirectional_shortest_path(g_0, galaxy_A.id, galaxy_B.id)) - 1
         except nx.NetworkXNoPath:
             self.fail("Clusters disconnected.")
 
@@ -115,7 +123,7 @@ class TestUniversalIntegration(unittest.TestCase):
 
         g_1 = self._build_graph()
         try:
-            dist_1 = nx.shortest_path_length(g_1, galaxy_A.id, galaxy_B.id)
+            dist_1 = len(nx.bidirectional_shortest_path(g_1, galaxy_A.id, galaxy_B.id)) - 1
         except nx.NetworkXNoPath:
             dist_1 = dist_0
 
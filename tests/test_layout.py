@@ -0,0 +1,85 @@
+"""
+Unit Tests for the Barnes-Hut Force-Directed Layout
+
+Validates the layout used by the visualizer:
+1. Exactness: with theta = 0 the octree repulsion equals all-pairs repulsion
+2. Anchoring: fixed nodes end at exactly their given positions
+3. Shape: the layout returns one finite position per node
+"""
+
+import unittest
+import numpy as np
+
+from visuals.layout import barnes_hut_layout, _barnes_hut_repulsion
+
+class TestBarnesHutLayout(unittest.TestCase):
+
+    def setUp(self):
+        """Initialize a fixed random point set and a ring graph for each test."""
+        self.rng = np.random.default_rng(0)
+        self.node_count = 200
+        self.positions = self.rng.random((self.node_count, 3))
+        ring = np.arange(self.node_count, dtype=np.int32)
+        self.edges = np.stack([ring, np.roll(ring, -1)], axis=1)
+
+    def test_repulsion_exact_at_zero_theta(self):
+        """
+        Exactness.
+
+        Validates that opening every cell reduces the Barnes-Hut repulsion
+        to the exact all-pairs sum of k^2 / d along each separation.
+        """
+        k = np.sqrt(1.0 / self.node_count)
+        delta = self.positions[:, None, :] - self.positions[None, :, :]
+        distance2 = np.einsum("ijk,ijk->ij", delta, delta)
+        np.fill_diagonal(distance2, np.inf)
+        exact = np.einsum("ij,ijk->ik", k * k / distance2, delta)
+
+        approximate = _barnes_hut_repulsion(self.positions, k, theta=0.0, max_depth=10)
+
+        np.testing.assert_allclose(approximate, exact, rtol=1e-9, atol=1e-12)
+
+    def test_fixed_nodes_keep_positions(self):
+        """
+        Anchoring.
+
+        Validates that nodes listed in fixed end at exactly their rows of pos.
+        """
+        fixed = np.array([0, 17, 99])
+        result = barnes_hut_layout(self.edges, self.node_count, iterations=20,
+                                   pos=self.positions, fixed=fixed, seed=0)
+
+        np.testing.assert_array_equal(result[fixed], self.positions[fixed])
+
+    def test_initial_positions_from_pos(self):
+        """
+        Initialization.
+
+        Validates that pos gives the starting positions of every node and
+        is not modified by the layout.
+        """
+        initial = self.positions.copy()
+        result = barnes_hut_layout(self.edges, self.node_count, iterations=0, pos=self.positions)
+
+        np.testing.assert_array_equal(result, initial)
+        np.testing.assert_array_equal(self.positions, initial)
+
+    def test_fixed_requires_positions(self):
+        """Validates that fixing nodes without positions is rejected."""
+        with self.assertRaises(ValueError):
+            barnes_hut_layout(self.edges, self.node_count, fixed=np.array([0]))
+
+    def test_output_shape_and_finite(self):
+        """
+        Shape.
+
+        Validates that the layout returns an (N, dim) array of finite values
+        in both two and three dimensions.
+        """
+        for dim in (2, 3):
+            result = barnes_hut_layout(self.edges, self.node_count, dim=dim, iterations=20, seed=0)
+            self.assertEqual(result.shape, (self.node_count, dim))
+            self.assertTrue(np.isfinite(result).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,8 @@ import unittest
 import networkx as nx
 import numpy as np
 import random
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from typing import List, Tuple, Optional, Dict, Set
 
 # Import the implementation from the 'distinction.py' file
@@ -30,11 +32,25 @@ class TestEmergentPhysics(unittest.TestCase):
     def _build_graph_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> nx.Graph:
         """Convert engine state snapshot to NetworkX graph for analysis."""
         distinctions, relationships = state
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in distinctions])
-        g.add_edges_from(relationships)
+        g = nx.Graph(relationships)
+        g.add_nodes_from(d.id for d in distinctions)
         return g
 
+    def _build_matrix_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Tuple[csr_matrix, Dict[str, int]]:
+        """
+        Convert engine state snapshot to a sparse adjacency matrix over integer indices.
+
+        Returns the matrix and the mapping from distinction ID to row index.
+        """
+        distinctions, relationships = state
+        id_to_idx = {d.id: i for i, d in enumerate(distinctions)}
+        edge_count = len(relationships)
+        rows = np.fromiter((id_to_idx[id_a] for id_a, _ in relationships), dtype=np.int32, count=edge_count)
+        cols = np.fromiter((id_to_idx[id_b] for _, id_b in relationships), dtype=np.int32, count=edge_count)
+        data = np.ones(edge_count, dtype=np.int8)
+        adjacency = coo_matrix((data, (rows, cols)), shape=(len(id_to_idx), len(id_to_idx))).tocsr()
+        return adjacency, id_to_idx
+
     def _evolve_universe_locally(self, steps: int):
         """
         Execute synthesis operations with local selection bias.
@@ -49,92 +65,141 @@ class TestEmergentPhysics(unittest.TestCase):
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        g = self._build_graph_from_snapshot(self.engine.get_state_snapshot())
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(g.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(g.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
+            neighborhood_ids = nx.single_source_shortest_path_length(g, a.id, cutoff=2)
+            neighborhood_ids.pop(a.id, None)
 
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
             if c.id not in distinction_map:
                 current_distinctions.append(c)
                 distinction_map[c.id] = c
+                g.add_edge(c.id, a.id)
+                g.add_edge(c.id, b.id)
 
     def _get_local_subprocess(self, g: nx.Graph, start_node_id: str, radius=2) -> Set[str]:
         """Return node IDs within specified radius of start node."""
-        return set(nx.ego_graph(g, start_node_id, radius=radius).nodes())
+        return set(nx.single_source_shortest_path_length(g, start_node_id, cutoff=radius))
 
-    def _get_emergent_state(self, g: nx.Graph, node_id: str) -> Dict[str, float]:
+    def _get_cached_subprocess(self, cache: Dict[str, Set[str]], g: nx.Graph, start_node_id: str) -> Set[str]:
+        """Return the local subprocess of a node, computing it only on a cache miss."""
+        subprocess_nodes = cache.get(start_node_id)
+        if subprocess_nodes is None:
+            subprocess_nodes = cache[start_node_id] = self._get_local_subprocess(g, start_node_id)
+        return subprocess_nodes
+
+    def _get_emergent_ages(self, adjacency: csr_matrix, id_to_idx: Dict[str, int]) -> Dict[str, float]:
+        """
+        Measure age (shortest path distance from primordial node d0) of every node.
+
+        Uses a single compiled traversal from the origin. Nodes unreachable
+        from the origin have age 0.
+        """
+        distances = dijkstra(adjacency, directed=False, unweighted=True, indices=id_to_idx[self.origin_id])
+        distances[np.isinf(distances)] = 0.0
+        return dict(zip(id_to_idx, distances.tolist()))
+
+    def _get_emergent_state(self, node_id: str, coherences: Dict[str, float], ages: Dict[str, float]) -> Dict[str, float]:
         """
         Measure structural state of a node.
 
         Returns coherence (clustering coefficient) and age (shortest path
-        distance from primordial node d0).
+        distance from primordial node d0), both precomputed in batch.
         """
-        coherence = nx.clustering(g, node_id)
+        return {"qm_coherence": coherences[node_id], "gr_age": ages.get(node_id, 0.0)}
 
-        try:
-            age = nx.shortest_path_length(g, source=self.origin_id, target=node_id)
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            age = 0
-            
-        return {"qm_coherence": coherence, "gr_age": float(age)}
 
-
-    def _evolve_subprocess_A_with_B(self, engine_state: Tuple[Set[Distinction], Set[Tuple[str, str]]],
-                                     subprocess_A_nodes: Set[str],
+    def _evolve_subprocess_A_with_B(self, subprocess_A_nodes: Set[str],
                                      subprocess_B_nodes: Set[str],
-                                     steps: int) -> Tuple[Set[Distinction], Set[Tuple[str, str]]]:
+                                     steps: int) -> List[Tuple[str, str]]:
         """
         Execute cross-subprocess synthesis operations.
 
-        Creates engine clone and synthesizes pairs where one member is from
-        subprocess A and the other from subprocess B. Measures interaction
-        dynamics between distinct structural regions.
+        Synthesizes pairs where one member is from subprocess A and the other
+        from subprocess B. Measures interaction dynamics between distinct
+        structural regions. Runs inside an engine transaction, so the
+        interaction is discarded on return. Returns the relationships it
+        created.
         """
-        temp_engine = DistinctionEngine()
-        distinctions, relationships = engine_state
-        temp_engine.all_distinctions = {d.id: d for d in distinctions}
-        temp_engine.relationships = relationships.copy()
+        all_distinctions = self.engine.all_distinctions
+        distinctions_A = [all_distinctions[node_id] for node_id in subprocess_A_nodes
+                          if node_id in all_distinctions]
+        distinctions_B = [all_distinctions[node_id] for node_id in subprocess_B_nodes
+                          if node_id in all_distinctions]
 
-        distinctions_A = [d for d in temp_engine.all_distinctions.values()
-                          if d.id in subprocess_A_nodes]
-        distinctions_B = [d for d in temp_engine.all_distinctions.values()
-                          if d.id in subprocess_B_nodes]
+        new_relationships = []
 
         if not distinctions_A or not distinctions_B:
-            return temp_engine.get_state_snapshot()
+            return new_relationships
+
+        with self.engine.transaction():
+            for _ in range(steps):
+                a = random.choice(distinctions_A)
+                b = random.choice(distinctions_B)
+                count_before = len(self.engine.all_distinctions)
+                c = self.engine.synthesize(a, b)
 
-        for _ in range(steps):
-            a = random.choice(distinctions_A)
-            b = random.choice(distinctions_B)
-            c = temp_engine.synthesize(a, b)
+                if len(self.engine.all_distinctions) > count_before:
+                    new_relationships.append((c.id, a.id))
+                    new_relationships.append((c.id, b.id))
 
-        return temp_engine.get_state_snapshot()
+        return new_relationships
+
+    def _run_interaction_sample(self, interaction: Tuple[Distinction, Distinction, Set[str], Set[str]],
+                                g_0: nx.Graph, coherences: Dict[str, float], ages: Dict[str, float],
+                                source_distances: np.ndarray, id_to_idx: Dict[str, int]) -> Optional[Tuple[float, float, int]]:
+        """
+        Measure one subprocess interaction against the initial state.
+
+        Returns the combined initial coherence, combined initial age and
+        resulting distance change, or None if the pair is disconnected.
+        The engine and g_0 are restored before returning.
+        """
+        node_A, node_B, subprocess_A_nodes, subprocess_B_nodes = interaction
+
+        distance_0 = source_distances[id_to_idx[node_B.id]]
+        if np.isinf(distance_0):
+            return None
+
+        state_A = self._get_emergent_state(node_A.id, coherences, ages)
+        state_B = self._get_emergent_state(node_B.id, coherences, ages)
+
+        new_relationships = self._evolve_subprocess_A_with_B(subprocess_A_nodes, subprocess_B_nodes, steps=50)
+
+        # Overlay the interaction on g_0 rather than rebuilding the graph; removing the new nodes restores it
+        g_0.add_edges_from(new_relationships)
+        try:
+            distance_1 = nx.shortest_path_length(g_0, source=node_A.id, target=node_B.id)
+        finally:
+            g_0.remove_nodes_from([new_id for new_id, _ in new_relationships])
+
+        initial_qm_state = state_A["qm_coherence"] + state_B["qm_coherence"]
+        initial_gr_state = state_A["gr_age"] + state_B["gr_age"]
+        return initial_qm_state, initial_gr_state, distance_1 - int(distance_0)
+
+    def _pearson_correlation(self, x: np.ndarray, y: np.ndarray) -> float:
+        """Return the Pearson correlation of two equal-length series without building a correlation matrix."""
+        deviations_x = x - x.mean()
+        deviations_y = y - y.mean()
+        return np.dot(deviations_x, deviations_y) / np.sqrt(
+            np.dot(deviations_x, deviations_x) * np.dot(deviations_y, deviations_y))
 
     def test_falsify_force_correlation(self):
         """
@@ -165,51 +230,61 @@ class TestEmergentPhysics(unittest.TestCase):
 
         print("   Sampling subprocess interaction dynamics...")
 
-        initial_states = []
-        resulting_forces = []
+        adjacency_0, id_to_idx_0 = self._build_matrix_from_snapshot(state_0)
+        ages_0 = self._get_emergent_ages(adjacency_0, id_to_idx_0)
 
         sample_size = 100
 
         print(f"   Testing {sample_size} interactions...")
 
-        for _ in range(sample_size):
-            try:
-                node_A, node_B = random.sample(all_distinctions, 2)
-                subprocess_A_nodes = self._get_local_subprocess(g_0, node_A.id)
-                subprocess_B_nodes = self._get_local_subprocess(g_0, node_B.id)
-
-                if not subprocess_A_nodes.isdisjoint(subprocess_B_nodes):
-                    continue
-
-                state_A = self._get_emergent_state(g_0, node_A.id)
-                state_B = self._get_emergent_state(g_0, node_B.id)
-                distance_0 = nx.shortest_path_length(g_0, source=node_A.id, target=node_B.id)
-
-                initial_qm_state = state_A["qm_coherence"] + state_B["qm_coherence"]
-                initial_gr_state = state_A["gr_age"] + state_B["gr_age"]
-                initial_states.append((initial_qm_state, initial_gr_state))
-
-                state_1 = self._evolve_subprocess_A_with_B(state_0, subprocess_A_nodes, subprocess_B_nodes, steps=50)
+        subprocess_cache = {}
+        interactions = []
 
-                g_1 = self._build_graph_from_snapshot(state_1)
-                distance_1 = nx.shortest_path_length(g_1, source=node_A.id, target=node_B.id)
+        distinction_count = len(all_distinctions)
 
-                delta_distance = distance_1 - distance_0
-                resulting_forces.append(delta_distance)
-
-            except (nx.NetworkXNoPath, nx.NodeNotFound):
+        for _ in range(sample_size):
+            # Two distinct indices drawn uniformly without building a sample list
+            i = random.randrange(distinction_count)
+            j = random.randrange(distinction_count - 1)
+            j += j >= i
+            node_A, node_B = all_distinctions[i], all_distinctions[j]
+            subprocess_A_nodes = self._get_cached_subprocess(subprocess_cache, g_0, node_A.id)
+            subprocess_B_nodes = self._get_cached_subprocess(subprocess_cache, g_0, node_B.id)
+
+            if subprocess_A_nodes.isdisjoint(subprocess_B_nodes):
+                interactions.append((node_A, node_B, subprocess_A_nodes, subprocess_B_nodes))
+
+        # One multi-source traversal yields every initial pair distance
+        source_rows = {}
+        for node_A, _, _, _ in interactions:
+            source_rows.setdefault(node_A.id, len(source_rows))
+        source_distances = dijkstra(adjacency_0, directed=False, unweighted=True,
+                                    indices=[id_to_idx_0[node_id] for node_id in source_rows])
+
+        coherences_0 = nx.clustering(g_0, nodes={d.id for interaction in interactions for d in interaction[:2]})
+
+        initial_qm_data = np.empty(len(interactions))
+        initial_gr_data = np.empty(len(interactions))
+        resulting_forces = np.empty(len(interactions), dtype=np.int32)
+        sample_count = 0
+
+        for interaction in interactions:
+            sample = self._run_interaction_sample(interaction, g_0, coherences_0, ages_0,
+                                                  source_distances[source_rows[interaction[0].id]], id_to_idx_0)
+            if sample is None:
                 continue
 
-        if len(resulting_forces) < 20:
-            self.fail(f"Could not gather enough valid interaction data (only {len(resulting_forces)} samples).")
+            initial_qm_data[sample_count], initial_gr_data[sample_count], resulting_forces[sample_count] = sample
+            sample_count += 1
 
-        print("   Sampling complete.")
+        if sample_count < 20:
+            self.fail(f"Could not gather enough valid interaction data (only {sample_count} samples).")
 
-        initial_qm_data = [s[0] for s in initial_states]
-        initial_gr_data = [s[1] for s in initial_states]
+        print("   Sampling complete.")
 
-        corr_qm_vs_force = np.corrcoef(initial_qm_data, resulting_forces)[0, 1]
-        corr_gr_vs_force = np.corrcoef(initial_gr_data, resulting_forces)[0, 1]
+        resulting_forces = resulting_forces[:sample_count]
+        corr_qm_vs_force = self._pearson_correlation(initial_qm_data[:sample_count], resulting_forces)
+        corr_gr_vs_force = self._pearson_correlation(initial_gr_data[:sample_count], resulting_forces)
 
         print(f"\n   Results:")
         print(f"   Coherence-Force correlation: {corr_qm_vs_force:.4f}")
@@ -22,9 +22,8 @@ class TestQuantumBraiding(unittest.TestCase):
 
     def _build_graph(self):
         state = self.engine.get_state_snapshot()
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in state[0]])
-        g.add_edges_from(state[1])
+        g = nx.Graph(state[1])
+        g.add_nodes_from(d.id for d in state[0])
         return g
 
     def _create_particle(self):
@@ -49,19 +48,25 @@ class TestQuantumBraiding(unittest.TestCase):
         print("\nTest: Quantum Braiding / Non-Abelian Statistics")
 
         print("   Creating base substrate...")
+        substrate = list(self.engine.all_distinctions.values())
         for _ in range(100):
-            self.engine.synthesize(random.choice(list(self.engine.all_distinctions.values())),
-                                   random.choice(list(self.engine.all_distinctions.values())))
+            count_before = len(self.engine.all_distinctions)
+            c = self.engine.synthesize(random.choice(substrate), random.choice(substrate))
+            if len(self.engine.all_distinctions) > count_before:
+                substrate.append(c)
 
         base_snapshot = self.engine.get_state_snapshot()
+        base_distinctions = {d.id: d for d in base_snapshot[0]}
+        base_relationships = base_snapshot[1]
+
+        # Both engines copy base_distinctions, so they share its insertion order and particles
+        base_nodes = list(base_distinctions.values())
+        p1, p2 = base_nodes[10], base_nodes[20]
 
         print("   Executing control sequence...")
         engine_A = DistinctionEngine()
-        engine_A.all_distinctions = {d.id: d for d in base_snapshot[0]}
-        engine_A.relationships = base_snapshot[1].copy()
-
-        p1 = list(engine_A.all_distinctions.values())[10]
-        p2 = list(engine_A.all_distinctions.values())[20]
+        engine_A.all_distinctions = base_distinctions.copy()
+        engine_A.relationships = base_relationships.copy()
 
         step_1_A = engine_A.synthesize(p1, engine_A.d0)
         step_2_A = engine_A.synthesize(p2, engine_A.d0)
@@ -69,11 +74,8 @@ class TestQuantumBraiding(unittest.TestCase):
 
         print("   Executing swapped sequence...")
         engine_B = DistinctionEngine()
-        engine_B.all_distinctions = {d.id: d for d in base_snapshot[0]}
-        engine_B.relationships = base_snapshot[1].copy()
-
-        p1 = list(engine_B.all_distinctions.values())[10]
-        p2 = list(engine_B.all_distinctions.values())[20]
+        engine_B.all_distinctions = base_distinctions.copy()
+        engine_B.relationships = base_relationships.copy()
 
         step_1_B = engine_B.synthesize(p2, engine_B.d0)
         step_2_B = engine_B.synthesize(p1, engine_B.d0)
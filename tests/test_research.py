@@ -13,8 +13,11 @@ Measurements use entirely emergent properties:
 
 import unittest
 import networkx as nx
+from networkx.algorithms import approximation
 import numpy as np
 import random
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from typing import List, Tuple, Optional, Dict, Set
 
 # Import the implementation from the 'distinction.py' file
@@ -35,6 +38,40 @@ class TestFoundationalResearch(unittest.TestCase):
         g.add_edges_from(relationships)
         return g
 
+    def _build_edge_array_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Translate engine state snapshot relationships to an (E, 2) int32 array of node indices.
+
+        String IDs are resolved once here; returns the edge array and the
+        mapping from distinction ID to index.
+        """
+        distinctions, relationships = state
+        id_to_idx = {d.id: i for i, d in enumerate(distinctions)}
+        edges = np.fromiter((id_to_idx[node_id] for edge in relationships for node_id in edge),
+                            dtype=np.int32, count=2 * len(relationships)).reshape(-1, 2)
+        return edges, id_to_idx
+
+    def _build_matrix_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Tuple[csr_matrix, Dict[str, int]]:
+        """
+        Convert engine state snapshot to a symmetric sparse adjacency matrix over integer indices.
+
+        Returns the matrix and the mapping from distinction ID to row index.
+        """
+        edges, id_to_idx = self._build_edge_array_from_snapshot(state)
+        data = np.ones(edges.size, dtype=np.int32)
+        shape = (len(id_to_idx), len(id_to_idx))
+        adjacency = coo_matrix((data, (edges.ravel(), edges[:, ::-1].ravel())), shape=shape).tocsr()
+        return adjacency, id_to_idx
+
+    def _build_adjacency_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Dict[str, Set[str]]:
+        """Convert engine state snapshot to a mutable adjacency map for local selection."""
+        distinctions, relationships = state
+        adjacency = {d.id: set() for d in distinctions}
+        for id_a, id_b in relationships:
+            adjacency[id_a].add(id_b)
+            adjacency[id_b].add(id_a)
+        return adjacency
+
     def _evolve_universe(self, steps: int):
         """
         Execute synthesis operations with local selection bias.
@@ -49,40 +86,36 @@ class TestFoundationalResearch(unittest.TestCase):
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        adjacency = self._build_adjacency_from_snapshot(self.engine.get_state_snapshot())
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(g.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(g.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
+            neighbor_ids = adjacency[a.id]
+            neighborhood_ids = neighbor_ids.union(*(adjacency[neighbor_id] for neighbor_id in neighbor_ids))
+            neighborhood_ids.discard(a.id)
 
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
             if c.id not in distinction_map:
                 current_distinctions.append(c)
                 distinction_map[c.id] = c
+                adjacency[c.id] = {a.id, b.id}
+                adjacency[a.id].add(c.id)
+                adjacency[b.id].add(c.id)
 
     def test_falsify_spontaneous_organization(self):
         """
@@ -99,7 +132,8 @@ class TestFoundationalResearch(unittest.TestCase):
 
         self.assertGreater(g.number_of_nodes(), 100, "Evolution failed to produce enough distinctions.")
 
-        emergent_coherence = nx.average_clustering(g)
+        # Sampled estimate; the threshold is two orders of magnitude below typical values
+        emergent_coherence = approximation.average_clustering(g, trials=1000, seed=0)
         print(f"   Average clustering coefficient: {emergent_coherence:.6f}")
 
         self.assertGreater(emergent_coherence, 0.001,
@@ -119,28 +153,42 @@ class TestFoundationalResearch(unittest.TestCase):
         g = self._build_graph_from_snapshot(state)
         self.assertGreater(g.number_of_nodes(), 150)
 
-        degrees = [d for n, d in g.degree()]
-        if not degrees:
+        degrees = np.fromiter((d for _, d in g.degree()), dtype=np.int32, count=g.number_of_nodes())
+        if not degrees.size:
             self.fail("Could not measure degrees; graph is empty.")
 
-        mean_degree = np.mean(degrees)
-        std_dev_degree = np.std(degrees)
+        mean_degree = degrees.mean()
+        std_dev_degree = degrees.std()
         print(f"   Degree distribution: mean={mean_degree:.2f}, std_dev={std_dev_degree:.2f}")
 
         self.assertGreater(std_dev_degree, mean_degree * 0.5,
                          "FALSIFIED: System lacks complexity.")
         print("   Hypothesis sustained: Fat-tailed complexity detected.")
 
-    def _get_emergent_age(self, g: nx.Graph, node_id: str, origin_id: str) -> int:
+    def _get_emergent_coherences(self, adjacency: csr_matrix, id_to_idx: Dict[str, int]) -> Dict[str, float]:
+        """
+        Measure coherence (clustering coefficient) of every node.
+
+        Triangles through each node are counted with sparse matrix products,
+        giving the same values as nx.clustering on a simple graph.
+        """
+        degrees = np.diff(adjacency.indptr)
+        triangles_doubled = np.asarray((adjacency @ adjacency).multiply(adjacency).sum(axis=1)).ravel()
+        possible_doubled = degrees * (degrees - 1)
+        coherences = np.divide(triangles_doubled, possible_doubled,
+                               out=np.zeros(len(degrees)), where=possible_doubled > 0)
+        return dict(zip(id_to_idx, coherences.tolist()))
+
+    def _get_emergent_ages(self, adjacency: csr_matrix, id_to_idx: Dict[str, int], origin_id: str) -> Dict[str, int]:
         """
-        Calculate causal distance from origin.
+        Measure age (shortest path distance from origin) of every node.
 
-        Returns shortest path length from primordial node d0, or 0 if unreachable.
+        Uses a single compiled traversal from the origin. Nodes unreachable
+        from the origin have age 0.
         """
-        try:
-            return nx.shortest_path_length(g, source=origin_id, target=node_id)
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            return 0
+        distances = dijkstra(adjacency, unweighted=True, indices=id_to_idx[origin_id])
+        distances[np.isinf(distances)] = 0
+        return dict(zip(id_to_idx, distances.astype(np.int64).tolist()))
 
     def _get_emergent_state_vector(self, g: nx.Graph, d: Distinction, metrics: Dict) -> np.ndarray:
         """
@@ -150,13 +198,16 @@ class TestFoundationalResearch(unittest.TestCase):
         - coherence: clustering coefficient
         - usage: degree / max_degree
         - age: path_from_origin / max_path_from_origin
+
+        Ages are read from metrics["ages"], precomputed by one traversal
+        from the origin; nodes absent from it have age 0.
         """
         if d is None or d.id not in g:
             return np.array([0, 0, 0])
 
         coherence = nx.clustering(g, d.id)
         usage = g.degree(d.id) / metrics["max_degree"] if metrics["max_degree"] > 0 else 0
-        age = self._get_emergent_age(g, d.id, metrics["origin_id"]) / metrics["max_age"] if metrics["max_age"] > 0 else 0
+        age = metrics["ages"].get(d.id, 0) / metrics["max_age"] if metrics["max_age"] > 0 else 0
 
         vector = np.array([coherence, usage, age])
         return vector
@@ -178,43 +229,39 @@ class TestFoundationalResearch(unittest.TestCase):
         self._evolve_universe(steps=2000)
 
         state = self.engine.get_state_snapshot()
-        g = self._build_graph_from_snapshot(state)
         all_distinctions = list(state[0])
 
         if len(all_distinctions) < 100:
             self.fail("Universe too small to test.")
 
         print("   Calculating emergent properties...")
-        all_degrees = dict(g.degree())
-        all_coherences = nx.clustering(g)
+        # One structure serves every measurement of this snapshot
+        adjacency, id_to_idx = self._build_matrix_from_snapshot(state)
+        all_degrees = dict(zip(id_to_idx, np.diff(adjacency.indptr).tolist()))
+        all_coherences = self._get_emergent_coherences(adjacency, id_to_idx)
         origin_id = self.engine.d0.id
 
-        all_ages = {}
-        max_age = 0
-        for d in all_distinctions:
-            age = self._get_emergent_age(g, d.id, origin_id)
-            all_ages[d.id] = age
-            if age > max_age:
-                max_age = age
+        all_ages = self._get_emergent_ages(adjacency, id_to_idx, origin_id)
+        max_age = max(all_ages.values(), default=0)
 
         max_degree = max(all_degrees.values()) if all_degrees else 1
 
         if max_age == 0:
             self.fail("Universe has no age (graph is disconnected).")
 
-        coherence_list = []
-        age_list = []
-
-        for d in all_distinctions:
-            if d.id == origin_id: continue
-            coherence_list.append(all_coherences[d.id])
-            age_list.append(all_ages[d.id])
-
-        if not coherence_list:
+        measured_ids = [d.id for d in all_distinctions if d.id != origin_id]
+        if not measured_ids:
              self.fail("Could not measure any properties.")
 
-        correlation_matrix = np.corrcoef(coherence_list, age_list)
-        correlation = correlation_matrix[0, 1]
+        coherences = np.fromiter((all_coherences[node_id] for node_id in measured_ids),
+                                 dtype=np.float64, count=len(measured_ids))
+        ages = np.fromiter((all_ages[node_id] for node_id in measured_ids),
+                           dtype=np.float64, count=len(measured_ids))
+
+        deviations_coherence = coherences - coherences.mean()
+        deviations_age = ages - ages.mean()
+        correlation = np.dot(deviations_coherence, deviations_age) / np.sqrt(
+            np.dot(deviations_coherence, deviations_coherence) * np.dot(deviations_age, deviations_age))
 
         print(f"\n   Results:")
         print(f"   Coherence-Age correlation: {correlation:.4f}")
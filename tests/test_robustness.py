@@ -10,8 +10,13 @@ targeted hub removal, proving absence of scale-free topology.
 """
 
 import unittest
-import networkx as nx
+import numpy as np
 import random
+from collections import Counter
+from itertools import chain
+from typing import List
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import connected_components
 from engine import Distinction, DistinctionEngine
 
 class TestRobustness(unittest.TestCase):
@@ -19,13 +24,56 @@ class TestRobustness(unittest.TestCase):
     def setUp(self):
         self.engine = DistinctionEngine()
 
-    def _build_graph(self):
-        """Convert engine state snapshot to NetworkX graph for analysis."""
-        state = self.engine.get_state_snapshot()
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in state[0]])
-        g.add_edges_from(state[1])
-        return g
+    def _build_matrix(self) -> csr_matrix:
+        """Convert engine state snapshot to a symmetric sparse adjacency matrix for analysis."""
+        distinctions, relationships = self.engine.get_state_snapshot()
+        id_to_idx = {d.id: i for i, d in enumerate(distinctions)}
+        # String IDs are resolved once into an (E, 2) int32 edge array
+        edges = np.fromiter((id_to_idx[node_id] for edge in relationships for node_id in edge),
+                            dtype=np.int32, count=2 * len(relationships)).reshape(-1, 2)
+        data = np.ones(edges.size, dtype=np.int8)
+        shape = (len(id_to_idx), len(id_to_idx))
+        return coo_matrix((data, (edges.ravel(), edges[:, ::-1].ravel())), shape=shape).tocsr()
+
+    def _get_largest_component_size(self, adjacency: csr_matrix, surviving: np.ndarray) -> int:
+        """Return the node count of the largest connected component among surviving nodes."""
+        if not surviving.any():
+            return 0
+        _, labels = connected_components(adjacency[surviving][:, surviving], directed=False)
+        return int(np.bincount(labels).max())
+
+    def _build_weight_tree(self, weights: List[int], capacity: int) -> List[int]:
+        """
+        Build a Fenwick tree over node weights with room for capacity nodes.
+
+        Supports weight updates and weighted sampling in O(log n) each.
+        """
+        tree = [0] * (capacity + 1)
+        tree[1:len(weights) + 1] = weights
+        for index in range(1, capacity + 1):
+            parent = index + (index & -index)
+            if parent <= capacity:
+                tree[parent] += tree[index]
+        return tree
+
+    def _add_to_weight_tree(self, tree: List[int], node_index: int, delta: int):
+        """Add delta to the weight of the node at node_index."""
+        index = node_index + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _sample_weight_tree(self, tree: List[int], target: int) -> int:
+        """Return the index of the node whose cumulative weight range contains target."""
+        position = 0
+        step = 1 << ((len(tree) - 1).bit_length() - 1)
+        while step:
+            candidate = position + step
+            if candidate < len(tree) and tree[candidate] <= target:
+                position = candidate
+                target -= tree[candidate]
+            step >>= 1
+        return position
 
     def _evolve_scale_free(self, steps: int):
         """
@@ -34,16 +82,26 @@ class TestRobustness(unittest.TestCase):
         Preferentially selects high-degree nodes for synthesis to produce
         scale-free topology through preferential attachment.
         """
-        for _ in range(steps):
-            nodes = list(self.engine.all_distinctions.values())
-            if len(nodes) < 2: continue
+        nodes = list(self.engine.all_distinctions.values())
+        if len(nodes) < 2: return
 
-            g = self._build_graph()
-            degrees = dict(g.degree())
-            weights = [degrees.get(d.id, 0) + 1 for d in nodes]
+        # Each step creates at most one node, so the tree is sized for the final count.
+        degrees = Counter(chain.from_iterable(self.engine.relationships))
+        weight_tree = self._build_weight_tree([degrees[d.id] + 1 for d in nodes], len(nodes) + steps)
+        total_weight = sum(degrees[d.id] + 1 for d in nodes)
 
-            parents = random.choices(nodes, weights=weights, k=2)
-            self.engine.synthesize(parents[0], parents[1])
+        for _ in range(steps):
+            i = self._sample_weight_tree(weight_tree, random.randrange(total_weight))
+            j = self._sample_weight_tree(weight_tree, random.randrange(total_weight))
+            count_before = len(self.engine.all_distinctions)
+            c = self.engine.synthesize(nodes[i], nodes[j])
+
+            if len(self.engine.all_distinctions) > count_before:
+                self._add_to_weight_tree(weight_tree, len(nodes), 3)
+                nodes.append(c)
+                self._add_to_weight_tree(weight_tree, i, 1)
+                self._add_to_weight_tree(weight_tree, j, 1)
+                total_weight += 5
 
     def test_falsify_uniform_vulnerability(self):
         """
@@ -66,39 +124,35 @@ class TestRobustness(unittest.TestCase):
         print("   Executing 3000 synthesis operations...")
         self._evolve_scale_free(3000)
 
-        original_graph = self._build_graph()
-        if not nx.is_connected(original_graph):
-            largest = max(nx.connected_components(original_graph), key=len)
-            original_graph = original_graph.subgraph(largest).copy()
+        original_adjacency = self._build_matrix()
+        component_count, labels = connected_components(original_adjacency, directed=False)
+        if component_count > 1:
+            in_largest = labels == np.bincount(labels).argmax()
+            original_adjacency = original_adjacency[in_largest][:, in_largest]
 
-        initial_size = original_graph.number_of_nodes()
+        initial_size = original_adjacency.shape[0]
         print(f"   Graph size: {initial_size} nodes")
 
         attack_percent = 0.20
         num_to_remove = int(initial_size * attack_percent)
 
-        g_random = original_graph.copy()
-        nodes_to_remove = random.sample(list(g_random.nodes()), num_to_remove)
-        g_random.remove_nodes_from(nodes_to_remove)
+        surviving_random = np.ones(initial_size, dtype=bool)
+        nodes_to_remove = random.sample(range(initial_size), num_to_remove)
+        surviving_random[nodes_to_remove] = False
 
-        if nx.is_empty(g_random):
-            largest_random = 0
-        else:
-            largest_random = len(max(nx.connected_components(g_random), key=len))
+        largest_random = self._get_largest_component_size(original_adjacency, surviving_random)
 
         survival_random = largest_random / initial_size
         print(f"   Survival after random removal ({attack_percent:.0%}): {survival_random:.2%}")
 
-        g_target = original_graph.copy()
-        degrees = sorted(g_target.degree, key=lambda x: x[1], reverse=True)
+        surviving_target = np.ones(initial_size, dtype=bool)
+        degrees = np.diff(original_adjacency.indptr)
 
-        hubs_to_remove = [n for n, d in degrees[:num_to_remove]]
-        g_target.remove_nodes_from(hubs_to_remove)
+        # Partial selection of the highest-degree nodes; their relative order is irrelevant
+        hubs_to_remove = np.argpartition(-degrees, num_to_remove)[:num_to_remove]
+        surviving_target[hubs_to_remove] = False
 
-        if nx.is_empty(g_target):
-            largest_target = 0
-        else:
-            largest_target = len(max(nx.connected_components(g_target), key=len))
+        largest_target = self._get_largest_component_size(original_adjacency, surviving_target)
 
         survival_target = largest_target / initial_size
         print(f"   Survival after targeted hub removal ({attack_percent:.0%}): {survival_target:.2%}")
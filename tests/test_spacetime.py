@@ -11,9 +11,10 @@ in causal age, proving space and time are decoupled.
 """
 
 import unittest
-import networkx as nx
 import numpy as np
 import random
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from typing import List, Tuple, Optional, Dict, Set
 
 # Import the implementation from the 'distinction.py' file
@@ -25,13 +26,32 @@ class TestSpacetimeCoherence(unittest.TestCase):
         """Initialize a fresh engine instance for each test."""
         self.engine = DistinctionEngine()
 
-    def _build_graph_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> nx.Graph:
-        """Convert engine state snapshot to NetworkX graph for analysis."""
+    def _build_edge_array_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Translate engine state snapshot relationships to an (E, 2) int32 array of node indices.
+
+        String IDs are resolved once here; returns the edge array and the
+        mapping from distinction ID to index.
+        """
         distinctions, relationships = state
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in distinctions])
-        g.add_edges_from(relationships)
-        return g
+        id_to_idx = {d.id: i for i, d in enumerate(distinctions)}
+        edges = np.fromiter((id_to_idx[node_id] for edge in relationships for node_id in edge),
+                            dtype=np.int32, count=2 * len(relationships)).reshape(-1, 2)
+        return edges, id_to_idx
+
+    def _build_matrix_from_edges(self, edges: np.ndarray, node_count: int) -> csr_matrix:
+        """Convert an (E, 2) edge array to a sparse adjacency matrix storing each edge once."""
+        data = np.ones(len(edges), dtype=np.int8)
+        return coo_matrix((data, (edges[:, 0], edges[:, 1])), shape=(node_count, node_count)).tocsr()
+
+    def _build_adjacency_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Dict[str, Set[str]]:
+        """Convert engine state snapshot to a mutable adjacency map for local selection."""
+        distinctions, relationships = state
+        adjacency = {d.id: set() for d in distinctions}
+        for id_a, id_b in relationships:
+            adjacency[id_a].add(id_b)
+            adjacency[id_b].add(id_a)
+        return adjacency
 
     def _evolve_universe(self, steps: int):
         """
@@ -47,51 +67,47 @@ class TestSpacetimeCoherence(unittest.TestCase):
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        adjacency = self._build_adjacency_from_snapshot(self.engine.get_state_snapshot())
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(g.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(g.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
+            neighbor_ids = adjacency[a.id]
+            neighborhood_ids = neighbor_ids.union(*(adjacency[neighbor_id] for neighbor_id in neighbor_ids))
+            neighborhood_ids.discard(a.id)
 
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
             if c.id not in distinction_map:
                 current_distinctions.append(c)
                 distinction_map[c.id] = c
+                adjacency[c.id] = {a.id, b.id}
+                adjacency[a.id].add(c.id)
+                adjacency[b.id].add(c.id)
 
-    def _get_emergent_age(self, g: nx.Graph, node_id: str, origin_id: str) -> int:
+    def _get_emergent_ages(self, adjacency: csr_matrix, id_to_idx: Dict[str, int]) -> np.ndarray:
         """
-        Calculate causal distance from origin.
+        Calculate causal distance from origin for every node.
 
-        Returns shortest path length from primordial node d0, or 0 if unreachable.
+        Uses a single compiled traversal from primordial node d0 and returns
+        ages indexed by matrix row. Nodes unreachable from the origin have age 0.
         """
-        try:
-            return nx.shortest_path_length(g, source=origin_id, target=node_id)
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            return 0
+        distances = dijkstra(adjacency, directed=False, unweighted=True, indices=id_to_idx[self.engine.d0.id])
+        distances[np.isinf(distances)] = 0
+        return distances.astype(np.int64)
 
     def test_falsify_temporal_scrambling(self):
         """
@@ -113,43 +129,24 @@ class TestSpacetimeCoherence(unittest.TestCase):
         self._evolve_universe(steps=5000)
 
         state = self.engine.get_state_snapshot()
-        g = self._build_graph_from_snapshot(state)
+        edges, id_to_idx = self._build_edge_array_from_snapshot(state)
+        adjacency = self._build_matrix_from_edges(edges, len(id_to_idx))
 
-        self.assertGreater(g.number_of_nodes(), 500, "Evolution failed to produce enough distinctions.")
+        self.assertGreater(adjacency.shape[0], 500, "Evolution failed to produce enough distinctions.")
 
         print("   Calculating causal ages...")
-        origin_id = self.engine.d0.id
-        id_to_age_map = {}
-        max_age = 0
-
-        for d in state[0]:
-            age = self._get_emergent_age(g, d.id, origin_id)
-            id_to_age_map[d.id] = age
-            if age > max_age:
-                max_age = age
+        ages = self._get_emergent_ages(adjacency, id_to_idx)
+        max_age = int(ages.max())
 
         if max_age == 0:
             self.fail("Universe has no age (graph is disconnected).")
 
         print("   Measuring age differences across edges...")
-        age_distances = []
 
-        if not state[1]:
+        if not len(edges):
             self.fail("No relationships were formed.")
 
-        for id_a, id_b in state[1]:
-            try:
-                age_a = id_to_age_map[id_a]
-                age_b = id_to_age_map[id_b]
-                delta_age = abs(age_a - age_b)
-                age_distances.append(delta_age)
-            except KeyError:
-                continue
-
-        if not age_distances:
-            self.fail("Could not measure any age distances.")
-
-        avg_age_distance = np.mean(age_distances)
+        avg_age_distance = float(np.abs(ages[edges[:, 0]] - ages[edges[:, 1]]).mean())
 
         print(f"\n   Results:")
         print(f"   Maximum age (causal radius): {max_age} steps")
@@ -11,9 +11,10 @@ Falsification Targets:
 """
 
 import unittest
-import networkx as nx
 import numpy as np
 import random
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from typing import List, Tuple, Optional, Dict, Set
 
 # Import the implementation from the 'distinction.py' file
@@ -26,13 +27,29 @@ class TestTimeDynamics(unittest.TestCase):
         self.engine = DistinctionEngine()
         self.origin_id = self.engine.d0.id
 
-    def _build_graph_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> nx.Graph:
-        """Convert engine state snapshot to NetworkX graph for analysis."""
+    def _build_adjacency_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Dict[str, Set[str]]:
+        """Convert engine state snapshot to a mutable adjacency map for local selection."""
         distinctions, relationships = state
-        g = nx.Graph()
-        g.add_nodes_from([d.id for d in distinctions])
-        g.add_edges_from(relationships)
-        return g
+        adjacency = {d.id: set() for d in distinctions}
+        for id_a, id_b in relationships:
+            adjacency[id_a].add(id_b)
+            adjacency[id_b].add(id_a)
+        return adjacency
+
+    def _build_matrix_from_snapshot(self, state: Tuple[Set[Distinction], Set[Tuple[str, str]]]) -> Tuple[csr_matrix, Dict[str, int]]:
+        """
+        Convert engine state snapshot to a sparse adjacency matrix over integer indices.
+
+        Returns the matrix and the mapping from distinction ID to row index.
+        """
+        distinctions, relationships = state
+        id_to_idx = {d.id: i for i, d in enumerate(distinctions)}
+        edge_count = len(relationships)
+        rows = np.fromiter((id_to_idx[id_a] for id_a, _ in relationships), dtype=np.int32, count=edge_count)
+        cols = np.fromiter((id_to_idx[id_b] for _, id_b in relationships), dtype=np.int32, count=edge_count)
+        data = np.ones(edge_count, dtype=np.int8)
+        adjacency = coo_matrix((data, (rows, cols)), shape=(len(id_to_idx), len(id_to_idx))).tocsr()
+        return adjacency, id_to_idx
 
     def _evolve_universe_locally(self, steps: int):
         """
@@ -48,59 +65,47 @@ class TestTimeDynamics(unittest.TestCase):
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        adjacency = self._build_adjacency_from_snapshot(self.engine.get_state_snapshot())
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(g.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(g.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
+            neighbor_ids = adjacency[a.id]
+            neighborhood_ids = neighbor_ids.union(*(adjacency[neighbor_id] for neighbor_id in neighbor_ids))
+            neighborhood_ids.discard(a.id)
 
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
             if c.id not in distinction_map:
                 current_distinctions.append(c)
                 distinction_map[c.id] = c
+                adjacency[c.id] = {a.id, b.id}
+                adjacency[a.id].add(c.id)
+                adjacency[b.id].add(c.id)
 
-    def _get_emergent_age_radius(self, g: nx.Graph) -> int:
+    def _get_emergent_age_radius(self, adjacency: csr_matrix, id_to_idx: Dict[str, int]) -> int:
         """
         Calculate maximum causal distance from origin.
 
         Returns maximum shortest path length from primordial node d0 across
         all reachable nodes, representing the causal radius of the graph.
         """
-        all_ages = []
-        for node_id in g.nodes():
-            if node_id == self.origin_id:
-                continue
-            try:
-                age = nx.shortest_path_length(g, source=self.origin_id, target=node_id)
-                all_ages.append(age)
-            except (nx.NetworkXNoPath, nx.NodeNotFound):
-                continue
-
-        return max(all_ages) if all_ages else 0
+        # One compiled traversal from the origin reaches every node that has an age
+        distances = dijkstra(adjacency, directed=False, unweighted=True, indices=id_to_idx[self.origin_id])
+        return int(distances[np.isfinite(distances)].max())
 
     def test_falsify_arrow_of_time(self):
         """
@@ -125,8 +130,7 @@ class TestTimeDynamics(unittest.TestCase):
         universe_age_history = []
 
         initial_state = self.engine.get_state_snapshot()
-        initial_graph = self._build_graph_from_snapshot(initial_state)
-        initial_age = self._get_emergent_age_radius(initial_graph)
+        initial_age = self._get_emergent_age_radius(*self._build_matrix_from_snapshot(initial_state))
         universe_age_history.append(initial_age)
 
         print(f"   Epoch 0: Causal radius = {initial_age}")
@@ -135,8 +139,7 @@ class TestTimeDynamics(unittest.TestCase):
             self._evolve_universe_locally(steps=steps_per_epoch)
 
             state = self.engine.get_state_snapshot()
-            g = self._build_graph_from_snapshot(state)
-            current_age = self._get_emergent_age_radius(g)
+            current_age = self._get_emergent_age_radius(*self._build_matrix_from_snapshot(state))
 
             print(f"   Epoch {i}: Causal radius = {current_age}")
 
@@ -6,8 +6,9 @@ the state and evolution of the distinction engine.
 
 Modules:
 - visualization: Core visualization functionality
+- layout: Force-directed layout with Barnes-Hut repulsion
 """
 
-from . import visualization
+from . import layout, visualization
 
-__all__ = ['visualization']
+__all__ = ['layout', 'visualization']
@@ -0,0 +1,152 @@
+"""
+Force-Directed Layout
+
+Fruchterman-Reingold layout over integer-indexed graphs with Barnes-Hut
+approximated repulsion. Repulsion from distant groups of nodes is taken
+from their octree cell's center of mass, so each iteration costs
+O(N log N) rather than O(N^2).
+"""
+
+import numpy as np
+from typing import Optional
+
+
+def _build_octree(pos: np.ndarray, max_depth: int):
+    """
+    Build a complete octree over node positions, one level per depth.
+
+    Returns per-level lists of: node-to-cell assignment, cell masses, cell
+    centers of mass, and for each cell the start and count of its children
+    in the next level. Also returns the side length of the root cell.
+    """
+    node_count, dim = pos.shape
+    lower = pos.min(axis=0)
+    size = float((pos.max(axis=0) - lower).max()) or 1.0
+    # Integer coordinates on the finest grid; a cell at depth l is a prefix of these bits
+    grid = np.minimum(((pos - lower) / size * (1 << max_depth)).astype(np.int64), (1 << max_depth) - 1)
+
+    node_cells, masses, centers, child_starts, child_counts = [], [], [], [], []
+    keys = np.zeros(node_count, dtype=np.int64)
+    parent_keys = None
+    for depth in range(max_depth + 1):
+        if depth:
+            # Appending one bit per axis keeps every cell's children contiguous in sorted key order
+            shift = max_depth - depth
+            for axis in range(dim):
+                keys = (keys << 1) | ((grid[:, axis] >> shift) & 1)
+        cell_keys, cell_of_node = np.unique(keys, return_inverse=True)
+        mass = np.bincount(cell_of_node, minlength=len(cell_keys)).astype(np.float64)
+        center = np.stack([np.bincount(cell_of_node, weights=pos[:, axis], minlength=len(cell_keys))
+                           for axis in range(dim)], axis=1) / mass[:, None]
+
+        if parent_keys is not None:
+            parent_index = np.searchsorted(parent_keys, cell_keys >> dim)
+            child_counts.append(np.bincount(parent_index, minlength=len(parent_keys)))
+            child_starts.append(np.searchsorted(parent_index, np.arange(len(parent_keys))))
+
+        node_cells.append(cell_of_node)
+        masses.append(mass)
+        centers.append(center)
+        parent_keys = cell_keys
+
+    return node_cells, masses, centers, child_starts, child_counts, size
+
+
+def _barnes_hut_repulsion(pos: np.ndarray, k: float, theta: float, max_depth: int) -> np.ndarray:
+    """
+    Approximate the Fruchterman-Reingold repulsive displacement k^2 / d for every node.
+
+    Traverses the octree for all nodes at once, one level at a time. A cell
+    is accepted when its side over its distance is below theta; otherwise
+    the (node, cell) pair is replaced by (node, child) pairs.
+    """
+    node_cells, masses, centers, child_starts, child_counts, size = _build_octree(pos, max_depth)
+    displacement = np.zeros_like(pos)
+
+    nodes = np.arange(len(pos))
+    cells = np.zeros(len(pos), dtype=np.int64)
+    for depth in range(max_depth + 1):
+        mass = masses[depth][cells]
+        own_cell = node_cells[depth][nodes] == cells
+        center = centers[depth][cells]
+        if depth == max_depth:
+            # Finest cells are not split further; exclude the node itself from its own cell
+            others = np.maximum(mass - own_cell, 1.0)
+            center = np.where(own_cell[:, None], (center * mass[:, None] - pos[nodes]) / others[:, None], center)
+            mass = mass - own_cell
+
+        delta = pos[nodes] - center
+        distance2 = np.maximum(np.einsum("ij,ij->i", delta, delta), 1e-12)
+        side = size / (1 << depth)
+        accepted = ~own_cell & ((mass == 1) | (side * side < theta * theta * distance2))
+        if depth == max_depth:
+            accepted = mass > 0
+
+        weight = np.where(accepted, mass * k * k / distance2, 0.0)
+        for axis in range(pos.shape[1]):
+            displacement[:, axis] += np.bincount(nodes, weights=weight * delta[:, axis], minlength=len(pos))
+
+        if depth == max_depth:
+            break
+        # Own cells holding only the node itself contribute nothing and are dropped
+        expand = ~accepted & ~(own_cell & (mass == 1))
+        nodes, cells = nodes[expand], cells[expand]
+        counts = child_counts[depth][cells]
+        starts = child_starts[depth][cells]
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        nodes = np.repeat(nodes, counts)
+        cells = np.repeat(starts, counts) + offsets
+        if not len(nodes):
+            break
+
+    return displacement
+
+
+def barnes_hut_layout(edges: np.ndarray, node_count: int, dim: int = 3, iterations: int = 100,
+                      theta: float = 0.9, pos: Optional[np.ndarray] = None,
+                      fixed: Optional[np.ndarray] = None, seed: Optional[int] = None,
+                      max_depth: int = 10) -> np.ndarray:
+    """
+    Position nodes with Fruchterman-Reingold forces and Barnes-Hut repulsion.
+
+    edges is an (E, 2) array of node indices. pos, an (N, dim) array, gives
+    the initial positions; without it nodes start at random positions in
+    the unit cube. Nodes whose indices are in fixed stay at their rows of
+    pos, which is then required. The step size cools linearly from a tenth
+    of the layout extent to zero over the iterations.
+
+    Returns an (N, dim) array of positions.
+    """
+    if fixed is not None and pos is None:
+        raise ValueError("nodes are fixed without positions given")
+
+    if pos is not None:
+        positions = np.array(pos, dtype=np.float64)
+    else:
+        positions = np.random.default_rng(seed).random((node_count, dim))
+    movable = np.ones(node_count, dtype=bool)
+    if fixed is not None:
+        movable[fixed] = False
+
+    k = np.sqrt(1.0 / node_count)
+    temperature = 0.1 * float(np.ptp(positions, axis=0).max())
+    cooling = temperature / (iterations + 1)
+    source, target = edges[:, 0], edges[:, 1]
+
+    for _ in range(iterations):
+        displacement = _barnes_hut_repulsion(positions, k, theta, max_depth)
+
+        delta = positions[source] - positions[target]
+        distance = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        # Attraction d^2 / k along each edge, applied with opposite signs to its endpoints
+        pull = delta * (distance / k)[:, None]
+        for axis in range(dim):
+            displacement[:, axis] -= np.bincount(source, weights=pull[:, axis], minlength=node_count)
+            displacement[:, axis] += np.bincount(target, weights=pull[:, axis], minlength=node_count)
+
+        length = np.maximum(np.sqrt(np.einsum("ij,ij->i", displacement, displacement)), 0.01)
+        step = displacement * (np.minimum(length, temperature) / length)[:, None]
+        positions[movable] += step[movable]
+        temperature -= cooling
+
+    return positions
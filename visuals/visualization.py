@@ -9,9 +9,12 @@ positions emerge from graph connectivity through spring layout algorithm.
 import networkx as nx
 import numpy as np
 import random
-from typing import Set, Tuple, Dict, List
+from typing import Set, Tuple, Dict, List, Optional
 import plotly.graph_objects as go
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from engine import Distinction, DistinctionEngine
+from visuals.layout import barnes_hut_layout
 
 
 class UniverseVisualizer:
@@ -36,6 +39,23 @@ class UniverseVisualizer:
         g.add_edges_from(relationships)
         return g
 
+    def _build_edge_array(self) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Translate the graph's edges to an (E, 2) int32 array of node indices.
+
+        Returns the edge array and the mapping from distinction ID to index,
+        in graph node order.
+        """
+        node_to_idx = {node_id: i for i, node_id in enumerate(self.graph)}
+        edges = np.fromiter((node_to_idx[node_id] for edge in self.graph.edges() for node_id in edge),
+                            dtype=np.int32, count=2 * self.graph.number_of_edges()).reshape(-1, 2)
+        return edges, node_to_idx
+
+    def _build_matrix(self, edges: np.ndarray, node_count: int) -> csr_matrix:
+        """Convert an (E, 2) edge array to a symmetric sparse adjacency matrix."""
+        data = np.ones(edges.size, dtype=np.int32)
+        return coo_matrix((data, (edges.ravel(), edges[:, ::-1].ravel())), shape=(node_count, node_count)).tocsr()
+
     def _evolve_universe_locally(self, steps: int):
         """
         Execute synthesis operations with local selection bias.
@@ -49,34 +69,28 @@ class UniverseVisualizer:
 
         distinction_map = {d.id: d for d in current_distinctions}
 
+        self.graph = self._build_graph_from_snapshot(self.engine.get_state_snapshot())
+        adjacency = self.graph.adj
+
         for i in range(steps):
-            state = self.engine.get_state_snapshot()
-            self.graph = self._build_graph_from_snapshot(state) 
-            
             if len(current_distinctions) < 2:
                 break
                 
             a = random.choice(current_distinctions)
             b = None
 
-            try:
-                neighborhood_ids = set(self.graph.neighbors(a.id))
-                for neighbor_id in list(neighborhood_ids):
-                    neighborhood_ids.update(self.graph.neighbors(neighbor_id))
-                neighborhood_ids.discard(a.id)
-                
-                if neighborhood_ids:
-                    b_id = random.choice(list(neighborhood_ids))
-                    b = distinction_map.get(b_id)
-            
-            except (nx.NetworkXError, KeyError):
-                pass 
+            neighbor_ids = adjacency[a.id]
+            neighborhood_ids = set(neighbor_ids).union(*(adjacency[neighbor_id] for neighbor_id in neighbor_ids))
+            neighborhood_ids.discard(a.id)
+
+            if neighborhood_ids:
+                b_id = random.choice(list(neighborhood_ids))
+                b = distinction_map.get(b_id)
             
             if b is None or b.id == a.id:
-                others = [d for d in current_distinctions if d.id != a.id]
-                if not others:
-                    continue
-                b = random.choice(others)
+                b = random.choice(current_distinctions)
+                while b.id == a.id:
+                    b = random.choice(current_distinctions)
             
             c = self.engine.synthesize(a, b)
             
@@ -105,21 +119,27 @@ class UniverseVisualizer:
         if not all_nodes:
             return {}
 
-        coherences = nx.clustering(self.graph)
-        degrees = dict(self.graph.degree())
+        # One sparse matrix serves every measurement
+        edges, node_to_idx = self._build_edge_array()
+        adjacency = self._build_matrix(edges, len(node_to_idx))
+
+        # Triangles through each node are counted with sparse matrix products, as in nx.clustering
+        degree_array = np.diff(adjacency.indptr)
+        triangles_doubled = np.asarray((adjacency @ adjacency).multiply(adjacency).sum(axis=1)).ravel()
+        possible_doubled = degree_array * (degree_array - 1)
+        coherence_array = np.divide(triangles_doubled, possible_doubled,
+                                    out=np.zeros(len(degree_array)), where=possible_doubled > 0)
+        coherences = dict(zip(node_to_idx, coherence_array.tolist()))
+        degrees = dict(zip(node_to_idx, degree_array.tolist()))
         max_degree = max(degrees.values()) if degrees else 1
 
+        # One compiled traversal from the origin; unreachable nodes have age 0
         ages = {}
-        max_age = 0
         if self.origin_id in self.graph:
-            for node_id in all_nodes:
-                try:
-                    age = nx.shortest_path_length(self.graph, source=self.origin_id, target=node_id)
-                except (nx.NetworkXNoPath, nx.NodeNotFound):
-                    age = 0 
-                ages[node_id] = age
-                if age > max_age:
-                    max_age = age
+            distances = dijkstra(adjacency, unweighted=True, indices=node_to_idx[self.origin_id])
+            distances[np.isinf(distances)] = 0
+            ages = dict(zip(node_to_idx, distances.astype(np.int64).tolist()))
+        max_age = max(ages.values(), default=0)
         
         for node_id in all_nodes:
             props = {
@@ -132,7 +152,9 @@ class UniverseVisualizer:
         return properties
 
 
-    def visualize_emergent_space(self, evolution_steps: int = 10000, output_html_file: str = "emergent_universe_spatial_view.html"):
+    def visualize_emergent_space(self, evolution_steps: int = 10000, output_html_file: str = "emergent_universe_spatial_view.html",
+                                 use_barnes_hut: bool = True, auto_open: bool = False,
+                                 return_html: bool = False) -> Optional[str]:
         """
         Generate 3D force-directed visualization of distinction graph.
 
@@ -140,6 +162,12 @@ class UniverseVisualizer:
         and renders interactive HTML visualization using Plotly. Origin node
         is fixed at coordinates (0,0,0). Node color represents age, node size
         represents coherence. Spatial positions emerge from graph connectivity.
+        With use_barnes_hut, repulsion is approximated with an octree;
+        otherwise NetworkX minimizes the exact layout energy.
+
+        Writes the HTML to output_html_file and opens it in a browser only if
+        auto_open is set. With return_html, nothing is written and the HTML
+        is returned instead.
         """
         print(f"Executing {evolution_steps} synthesis operations...")
         self._evolve_universe_locally(evolution_steps)
@@ -152,37 +180,37 @@ class UniverseVisualizer:
         node_properties = self._calculate_emergent_properties()
 
         print("Generating 3D force-directed layout...")
-        fixed_pos = {self.origin_id: [0, 0, 0]}
-        pos = nx.spring_layout(self.graph, dim=3, iterations=100, pos=fixed_pos, fixed=[self.origin_id])
-
-        x_coords = []
-        y_coords = []
-        z_coords = []
-        node_colors = []
-        node_sizes = []
-        node_texts = []
-        for node_id, props in node_properties.items():
-            if node_id in pos:
-                x_coords.append(pos[node_id][0])
-                y_coords.append(pos[node_id][1])
-                z_coords.append(pos[node_id][2])
-
-                node_colors.append(props["age"])
-                node_sizes.append(max(3, props["coherence"] * 30))
-
-                node_texts.append(f"ID: {node_id[:8]}<br>Age: {props['age']:.2f}<br>Coherence: {props['coherence']:.2f}<br>Usage: {props['usage']:.2f}")
-
-        edge_x = []
-        edge_y = []
-        edge_z = []
-        for edge in self.graph.edges():
-            id1, id2 = edge
-            if id1 in pos and id2 in pos:
-                edge_x.extend([pos[id1][0], pos[id2][0], None])
-                edge_y.extend([pos[id1][1], pos[id2][1], None])
-                edge_z.extend([pos[id1][2], pos[id2][2], None])
+        edges, node_to_idx = self._build_edge_array()
+        if use_barnes_hut:
+            origin_idx = node_to_idx[self.origin_id]
+            initial_pos = np.random.default_rng().random((len(node_to_idx), 3))
+            initial_pos[origin_idx] = 0.0
+            node_positions = barnes_hut_layout(edges, len(node_to_idx), dim=3, iterations=100,
+                                               pos=initial_pos, fixed=np.array([origin_idx]))
+        else:
+            fixed_pos = {self.origin_id: [0, 0, 0]}
+            # L-BFGS minimization of the Fruchterman-Reingold energy
+            pos = nx.spring_layout(self.graph, dim=3, iterations=100, pos=fixed_pos, fixed=[self.origin_id], method="energy")
+            # The layout dict follows graph node order, matching the edge array's indices
+            node_positions = np.array(list(pos.values()))
+
+        # Every graph node has properties and a position row; one array per attribute, in edge-index order
+        node_ids = list(node_to_idx)
+        node_count = len(node_ids)
+        node_ages = np.fromiter((node_properties[node_id]["age"] for node_id in node_ids), dtype=np.float64, count=node_count)
+        node_coherences = np.fromiter((node_properties[node_id]["coherence"] for node_id in node_ids), dtype=np.float64, count=node_count)
+        node_usages = np.fromiter((node_properties[node_id]["usage"] for node_id in node_ids), dtype=np.float64, count=node_count)
+        node_sizes = np.maximum(3, node_coherences * 30)
+        node_texts = [f"ID: {node_id[:8]}<br>Age: {age:.2f}<br>Coherence: {coherence:.2f}<br>Usage: {usage:.2f}"
+                      for node_id, age, coherence, usage in zip(node_ids, node_ages.tolist(), node_coherences.tolist(), node_usages.tolist())]
+
+        # Each edge is a segment start, end, NaN; the NaN breaks the line between segments.
+        # Single precision is ample for display and halves the trace payload
+        edge_points = np.full((3 * len(edges), 3), np.nan, dtype=np.float32)
+        edge_points[0::3] = node_positions[edges[:, 0]]
+        edge_points[1::3] = node_positions[edges[:, 1]]
         edges_trace = go.Scatter3d(
-            x=edge_x, y=edge_y, z=edge_z,
+            x=edge_points[:, 0], y=edge_points[:, 1], z=edge_points[:, 2],
             mode='lines',
             line=dict(color='grey', width=0.5),
             hoverinfo='none',
@@ -190,12 +218,12 @@ class UniverseVisualizer:
         )
 
         nodes_trace = go.Scatter3d(
-            x=x_coords, y=y_coords, z=z_coords,
+            x=node_positions[:, 0], y=node_positions[:, 1], z=node_positions[:, 2],
             mode='markers',
             marker=dict(
                 symbol='circle',
                 size=node_sizes,
-                color=node_colors,
+                color=node_ages,
                 colorscale='Plasma',
                 colorbar=dict(title='Emergent Age', thickness=20),
                 line=dict(color='black', width=0),
@@ -223,7 +251,11 @@ class UniverseVisualizer:
             hovermode='closest'
         )
 
-        fig.write_html(output_html_file, auto_open=True)
+        # Plotly.js is loaded from the CDN instead of being inlined; traces were built here, so skip schema validation
+        if return_html:
+            return fig.to_html(include_plotlyjs='cdn', validate=False)
+
+        fig.write_html(output_html_file, auto_open=auto_open, include_plotlyjs='cdn', validate=False)
         print(f"Visualization saved to {output_html_file}")
         print("Origin node fixed at (0,0,0).")
         print("Node color: age (darker = older, lighter = younger).")
@@ -234,4 +266,4 @@ class UniverseVisualizer:
 if __name__ == '__main__':
     engine = DistinctionEngine()
     visualizer = UniverseVisualizer(engine)
-    visualizer.visualize_emergent_space(evolution_steps=10000)
\ No newline at end of file
+    visualizer.visualize_emergent_space(evolution_steps=10000, auto_open=True)
\ No newline at end of file